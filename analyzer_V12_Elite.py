@@ -1,8 +1,8 @@
 import pandas as pd
 import numpy as np
 import os
-import glob
 from datetime import datetime, timedelta
+from multiprocessing import Pool, cpu_count
 
 # --- 核心配置 ---
 DATA_DIR = 'fund_data'
@@ -11,11 +11,61 @@ BACKTEST_REPORT = 'backtest_results.csv'
 # 修改点：指向 Excel 文件
 NAME_LIST_FILE = 'ETF列表.xlsx'
 BENCHMARK_CODE = '510300'
+# 扫描只用到的行情列：按需解析并指定类型，跳过成交量/振幅等无关列与类型推断
+KLINE_COLS = {'日期', '收盘', '最高', '最低'}
+KLINE_DTYPES = {'收盘': 'float64', '最高': 'float64', '最低': 'float64'}
 
 def get_beijing_time():
     """获取北京时间用于看板展示"""
     return (datetime.utcnow() + timedelta(hours=8)).strftime('%Y-%m-%d %H:%M')
 
+def list_fund_files(data_dir='fund_data'):
+    """列出行情目录下的 CSV 文件，目录不存在时返回空列表"""
+    if not os.path.isdir(data_dir): return []
+    with os.scandir(data_dir) as it:
+        return [e.path for e in it if e.name.endswith('.csv') and not e.name.startswith('.') and e.is_file()]
+
+def scan_file(file):
+    """单标的信号扫描 (供进程池调用)，未触发信号返回 None"""
+    code = os.path.basename(file)[:6]
+    if code == BENCHMARK_CODE: return None
+
+    try:
+        df = pd.read_csv(file, usecols=lambda c: c.strip() in KLINE_COLS, dtype=KLINE_DTYPES)
+        if len(df) < 40: return None
+        df.columns = [c.strip() for c in df.columns]
+        df['日期'] = pd.to_datetime(df['日期'])
+        if not df['日期'].is_monotonic_increasing:
+            df = df.sort_values('日期').reset_index(drop=True)
+        
+        # 最后一日的 MA5 与 40日高点，取尾部切片计算
+        close = df['收盘'].to_numpy()
+        curr_p = close[-1]
+        ma5 = close[-5:].mean()
+        hi40 = close[-40:].max()
+        dd = (curr_p - hi40) / hi40
+        
+        # 策略核心：站上MA5 且 40日高位回撤超过4%
+        if curr_p > ma5 and dd < -0.04:
+            # 计算ATR止损：ATR14 只依赖最后 14 根 K 线，np.maximum.reduce 一次求出 TR
+            high = df['最高'].to_numpy()[-14:]
+            low = df['最低'].to_numpy()[-14:]
+            prev_close = close[-15:-1]
+            tr = np.maximum.reduce([high - low, np.abs(high - prev_close), np.abs(low - prev_close)])
+            atr = tr.mean()
+            stop_p = min(curr_p - 3.0 * atr, curr_p * 0.93)
+            
+            return {
+                'date': df['日期'].iloc[-1].strftime('%Y-%m-%d'),
+                'code': code,
+                'price': round(curr_p, 3),
+                'stop': round(stop_p, 3),
+                'dd': f"{round(dd*100, 2)}%"
+            }
+    except:
+        pass
+    return None
+
 def analyze():
     print(f"🚀 启动 V12-Elite 分析系统... {get_beijing_time()}")
 
@@ -52,60 +102,26 @@ def analyze():
         print(f"❌ 关键错误: 缺少大盘数据 {bench_file}")
         return
     
-    df_b = pd.read_csv(bench_file)
+    df_b = pd.read_csv(bench_file, usecols=lambda c: c.strip() in KLINE_COLS, dtype=KLINE_DTYPES)
     df_b.columns = [c.strip() for c in df_b.columns]
     df_b['日期'] = pd.to_datetime(df_b['日期'])
-    df_b = df_b.sort_values('日期').reset_index(drop=True)
+    if not df_b['日期'].is_monotonic_increasing:
+        df_b = df_b.sort_values('日期').reset_index(drop=True)
     
-    curr_b = df_b['收盘'].iloc[-1]
-    ma20 = df_b['收盘'].rolling(20).mean().iloc[-1]
+    close_b = df_b['收盘'].to_numpy()
+    curr_b = close_b[-1]
+    ma20 = close_b[-20:].mean() if len(close_b) >= 20 else np.nan
     is_safe = curr_b >= ma20
     print(f"🚦 大盘状态: {'安全' if is_safe else '风险'} (现价:{curr_b:.3f} / MA20:{ma20:.3f})")
 
-    # 4. 扫描所有标的产生信号
-    results = []
-    target_files = glob.glob(os.path.join(DATA_DIR, "*.csv"))
+    # 4. 扫描所有标的产生信号 (多进程并行)
+    target_files = list_fund_files(DATA_DIR)
+    with Pool(cpu_count()) as p:
+        results = [r for r in p.map(scan_file, target_files) if r is not None]
 
-    for file in target_files:
-        code = os.path.basename(file)[:6]
-        if code == BENCHMARK_CODE: continue 
-        
-        try:
-            df = pd.read_csv(file)
-            df.columns = [c.strip() for c in df.columns]
-            df['日期'] = pd.to_datetime(df['日期'])
-            df = df.sort_values('日期').reset_index(drop=True)
-            
-            if len(df) < 40: continue
-            
-            last = df.iloc[-1]
-            curr_p = last['收盘']
-            ma5 = df['收盘'].rolling(5).mean().iloc[-1]
-            hi40 = df['收盘'].rolling(40).max().iloc[-1]
-            dd = (curr_p - hi40) / hi40
-            
-            # 策略核心：站上MA5 且 40日高位回撤超过4%
-            if curr_p > ma5 and dd < -0.04:
-                # 计算ATR止损
-                tr = np.maximum(df['最高'] - df['最低'], 
-                                np.maximum(abs(df['最高'] - df['收盘'].shift(1)), 
-                                           abs(df['最低'] - df['收盘'].shift(1))))
-                atr = tr.rolling(14).mean().iloc[-1]
-                stop_p = min(curr_p - 3.0 * atr, curr_p * 0.93)
-                
-                # 从 Excel 映射表获取名称
-                real_name = name_map.get(code, f"ETF_{code}")
-                
-                results.append({
-                    'date': last['日期'].strftime('%Y-%m-%d'),
-                    'code': code,
-                    'name': real_name,
-                    'price': round(curr_p, 3),
-                    'stop': round(stop_p, 3),
-                    'dd': f"{round(dd*100, 2)}%"
-                })
-        except:
-            continue
+    # 从 Excel 映射表获取名称
+    for r in results:
+        r['name'] = name_map.get(r['code'], f"ETF_{r['code']}")
 
     # 5. 写入 13 列账本
     header = "date,code,name,entry_price,index,price,stop,rsi,dd,score,lots,pos_pct,turnover\n"
@@ -113,33 +129,35 @@ def analyze():
     if results and is_safe:
         file_exists = os.path.exists(HISTORY_FILE)
         with open(HISTORY_FILE, 'a', encoding='utf_8_sig') as f:
-            if not file_exists:
-                f.write(header)
-            for r in results:
-                line = f"{r['date']},{r['code']},{r['name']},{r['price']},index,{r['price']},{r['stop']},0,{r['dd']},4,,,\n"
-                f.write(line)
+            lines = [header] if not file_exists else []
+            lines += [f"{r['date']},{r['code']},{r['name']},{r['price']},index,{r['price']},{r['stop']},0,{r['dd']},4,,,\n"
+                      for r in results]
+            f.write("".join(lines))
         print(f"💾 账本已更新，新增 {len(results)} 条记录")
 
     # 6. 更新 README.md 实时看板
+    parts = [
+        f"# 🏆 精选池实战看板 (V12-Elite)\n\n",
+        f"更新时间: `{get_beijing_time()}`\n\n",
+        f"### 🚦 市场环境: {'✅ 趋势安全' if is_safe else '🛑 风险避险'}\n",
+        f"- 510300 现价: `{curr_b:.3f}` (MA20: `{ma20:.3f}`)\n\n",
+    ]
+    if not is_safe:
+        parts.append("> ⚠️ 当前处于风险区域，策略已暂停新信号触发，请关注存量标的止损。\n\n")
+
+    parts.append("### 🎯 今日推荐入选\n")
+    if results:
+        parts.append("| 代码 | 名称 | 现价 | 止损参考 | 40D回撤 | 身份 |\n")
+        parts.append("| --- | --- | --- | --- | --- | --- |\n")
+        # 精英判定只算一次：按该布尔值稳定排序 (精英在前，其余保持扫描顺序)，身份标签取自同一判定
+        flagged = sorted(((r['code'] in elite_pool, r) for r in results), key=lambda x: x[0], reverse=True)
+        parts += [f"| {r['code']} | {r['name']} | {r['price']} | {r['stop']} | {r['dd']} | {'🏆精英' if is_elite else '⚪普通'} |\n"
+                  for is_elite, r in flagged]
+    else:
+        parts.append("*今日暂无满足筛选条件的标的。*\n")
+
     with open('README.md', 'w', encoding='utf_8_sig') as f:
-        f.write(f"# 🏆 精选池实战看板 (V12-Elite)\n\n")
-        f.write(f"更新时间: `{get_beijing_time()}`\n\n")
-        f.write(f"### 🚦 市场环境: {'✅ 趋势安全' if is_safe else '🛑 风险避险'}\n")
-        f.write(f"- 510300 现价: `{curr_b:.3f}` (MA20: `{ma20:.3f}`)\n\n")
-        
-        if not is_safe:
-            f.write("> ⚠️ 当前处于风险区域，策略已暂停新信号触发，请关注存量标的止损。\n\n")
-        
-        f.write("### 🎯 今日推荐入选\n")
-        if results:
-            f.write("| 代码 | 名称 | 现价 | 止损参考 | 40D回撤 | 身份 |\n")
-            f.write("| --- | --- | --- | --- | --- | --- |\n")
-            results_sorted = sorted(results, key=lambda x: x['code'] in elite_pool, reverse=True)
-            for r in results_sorted:
-                tag = "🏆精英" if r['code'] in elite_pool else "⚪普通"
-                f.write(f"| {r['code']} | {r['name']} | {r['price']} | {r['stop']} | {r['dd']} | {tag} |\n")
-        else:
-            f.write("*今日暂无满足筛选条件的标的。*\n")
+        f.write("".join(parts))
 
     print(f"🏁 分析流程结束。")
 
@@ -1,57 +1,71 @@
 import pandas as pd
 import os
-import glob
+from multiprocessing import Pool, cpu_count
+
+# 体检要求必须具备的日期与 OHLC 四列
+PRICE_COLS = ['开盘', '收盘', '最高', '最低']
+REQUIRED_COLS = ['日期'] + PRICE_COLS
+
+def check_file(file):
+    """单文件体检 (供进程池调用)，无问题返回 None"""
+    code = os.path.basename(file).replace('.csv', '')
+    issues = []
+    try:
+        # 1. 读取测试 (须全宽解析，才能拦截字段数超出表头的损坏行)
+        df = pd.read_csv(file)
+        df.columns = [c.strip() for c in df.columns]
+        
+        # 2. 检查关键列是否存在
+        missing_cols = [col for col in REQUIRED_COLS if col not in df.columns]
+        if missing_cols:
+            issues.append(f"缺少列: {missing_cols}")
+        
+        # 3. 检查数据长度 (回测至少需要50行)
+        if len(df) < 50:
+            issues.append(f"数据太短: 仅 {len(df)} 行")
+        
+        # 4. 检查日期格式与排序
+        try:
+            df['日期'] = pd.to_datetime(df['日期'])
+            # 检查是否有重复日期
+            if df['日期'].duplicated().any():
+                issues.append("存在重复日期")
+        except:
+            issues.append("日期格式异常")
+
+        # 5. 检查数值异常 (0值或空值)
+        if df[PRICE_COLS].isnull().values.any():
+            issues.append("包含空值(NaN)")
+        if (df[PRICE_COLS] <= 0).values.any():
+            issues.append("包含0或负数价格")
+
+        # 汇总结果
+        if issues:
+            return {'代码': code, '问题描述': " | ".join(issues)}
+    
+    except Exception as e:
+        return {'代码': code, '问题描述': f"文件损坏或无法读取: {str(e)}"}
+    return None
+
+def list_fund_files(data_dir='fund_data'):
+    """列出行情目录下的 CSV 文件，目录不存在时返回空列表"""
+    if not os.path.isdir(data_dir): return []
+    with os.scandir(data_dir) as it:
+        return [e.path for e in it if e.name.endswith('.csv') and not e.name.startswith('.') and e.is_file()]
 
 def check_data_health():
     data_dir = 'fund_data'
-    files = glob.glob(os.path.join(data_dir, "*.csv"))
+    files = list_fund_files(data_dir)
     
     if not files:
         print(f"❌ 错误：在 {data_dir} 文件夹下没找到任何 CSV 文件！")
         return
 
-    report = []
     print(f"🚀 开始体检，共发现 {len(files)} 个标的...\n")
 
-    for file in files:
-        code = os.path.basename(file).replace('.csv', '')
-        issues = []
-        try:
-            # 1. 读取测试
-            df = pd.read_csv(file)
-            df.columns = [c.strip() for c in df.columns]
-            
-            # 2. 检查关键列是否存在
-            required_cols = ['日期', '开盘', '收盘', '最高', '最低']
-            missing_cols = [col for col in required_cols if col not in df.columns]
-            if missing_cols:
-                issues.append(f"缺少列: {missing_cols}")
-            
-            # 3. 检查数据长度 (回测至少需要50行)
-            if len(df) < 50:
-                issues.append(f"数据太短: 仅 {len(df)} 行")
-            
-            # 4. 检查日期格式与排序
-            try:
-                df['日期'] = pd.to_datetime(df['日期'])
-                # 检查是否有重复日期
-                if df['日期'].duplicated().any():
-                    issues.append("存在重复日期")
-            except:
-                issues.append("日期格式异常")
-
-            # 5. 检查数值异常 (0值或空值)
-            if df[['开盘', '收盘', '最高', '最低']].isnull().values.any():
-                issues.append("包含空值(NaN)")
-            if (df[['开盘', '收盘', '最高', '最低']] <= 0).values.any():
-                issues.append("包含0或负数价格")
-
-            # 汇总结果
-            if issues:
-                report.append({'代码': code, '问题描述': " | ".join(issues)})
-        
-        except Exception as e:
-            report.append({'代码': code, '问题描述': f"文件损坏或无法读取: {str(e)}"})
+    # 各文件互不依赖：多进程并行体检，结果按文件顺序汇总
+    with Pool(cpu_count()) as p:
+        report = [r for r in p.map(check_file, files) if r is not None]
 
     # --- 输出诊断报告 ---
     print("="*50)
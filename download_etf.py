@@ -8,18 +8,50 @@ SAVE_DIR = "fund_data"
 if not os.path.exists(SAVE_DIR):
     os.makedirs(SAVE_DIR)
 
+def load_local_data(file_path):
+    """读取本地已有的历史行情，不存在或损坏时返回 None"""
+    if not os.path.exists(file_path):
+        return None
+    try:
+        df = pd.read_csv(file_path, encoding='utf-8-sig', dtype={'日期': str})
+        return df if not df.empty else None
+    except Exception:
+        return None
+
+def fetch_hist(fund_code, start_date="19700101"):
+    """从东方财富接口获取历史行情（前复权）"""
+    return ak.fund_etf_hist_em(symbol=fund_code, period="daily",
+                               start_date=start_date, end_date="20500101", adjust="qfq")
+
 def download_fund_data(fund_code):
-    """下载单个基金的历史行情并保存为CSV"""
+    """增量下载单个基金的历史行情并保存为CSV"""
     try:
         fund_code = str(fund_code).strip().zfill(6)
-        print(f"正在下载: {fund_code}")
-        
-        # 使用东方财富接口获取历史行情 
-        # 默认获取所有历史数据，包含日期、开盘、收盘、最高、最低等 [cite: 3541, 3543, 3544]
-        df = ak.fund_etf_hist_em(symbol=fund_code, period="daily", adjust="qfq")
-        
+        file_path = os.path.join(SAVE_DIR, f"{fund_code}.csv")
+        local_df = load_local_data(file_path)
+
+        df = None
+        if local_df is not None:
+            # 只请求本地最后一天之后的增量，最后一天本身用于校验复权基准
+            last_date = str(local_df['日期'].iloc[-1])
+            tail = fetch_hist(fund_code, start_date=last_date.replace('-', ''))
+            if tail.empty:
+                return f"{fund_code} 无新数据"
+            # 若除权导致前复权价格整体变动，首行收盘价对不上，需要全量重下
+            if str(tail['日期'].iloc[0]) == last_date and tail['收盘'].iloc[0] == local_df['收盘'].iloc[-1]:
+                if len(tail) == 1:
+                    return f"{fund_code} 无新数据"
+                print(f"正在增量更新: {fund_code} (+{len(tail) - 1})")
+                df = pd.concat([local_df.iloc[:-1], tail], ignore_index=True)
+
+        if df is None:
+            print(f"正在下载: {fund_code}")
+            # 默认获取所有历史数据，包含日期、开盘、收盘、最高、最低等 [cite: 3541, 3543, 3544]
+            df = fetch_hist(fund_code)
+
         if not df.empty:
-            file_path = os.path.join(SAVE_DIR, f"{fund_code}.csv")
+            # 统一按日期升序落盘，读取端据此可跳过排序
+            df = df.sort_values('日期', key=pd.to_datetime, kind='stable')
             df.to_csv(file_path, index=False, encoding='utf-8-sig')
             return f"{fund_code} 下载成功"
         else:
@@ -42,8 +74,9 @@ def main():
     with ThreadPoolExecutor(max_workers=10) as executor:
         results = list(executor.map(download_fund_data, fund_codes))
     
-    for res in results:
-        print(res)
+    # 汇总输出各只下载结果
+    if results:
+        print("\n".join(results))
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
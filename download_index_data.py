@@ -113,18 +113,19 @@ def fetch_and_save_index_data():
                 break
             
             # 增量更新逻辑：检查新数据是否已存在于本地
+            # 页内按日期降序，截取首个已存在日期之前的行
             has_new_data = False
-            for _, row in df_page.iterrows():
-                if latest_local_date and row['date'] > latest_local_date:
-                    all_new_data.append(row)
-                    has_new_data = True
-                elif latest_local_date and row['date'] <= latest_local_date:
+            if latest_local_date:
+                is_new = (df_page['date'] > latest_local_date).to_numpy()
+                has_new_data = bool(is_new.all())
+                n_new = len(is_new) if has_new_data else int(is_new.argmin())
+                if n_new:
+                    all_new_data.append(df_page.iloc[:n_new])
+                if not has_new_data:
                     logger.info("已下载到本地最新数据，增量更新完成。")
-                    has_new_data = False
-                    break
-                elif not latest_local_date:
-                    # 如果本地没有数据，则全部视为新数据
-                    all_new_data.append(row)
+            else:
+                # 如果本地没有数据，则全部视为新数据
+                all_new_data.append(df_page)
 
             if not has_new_data and latest_local_date:
                 break
@@ -144,8 +145,8 @@ def fetch_and_save_index_data():
             raise
 
     if all_new_data:
-        # 将新数据转换为DataFrame
-        new_df = pd.DataFrame(all_new_data)
+        # 各页新增片段合并为一个DataFrame
+        new_df = pd.concat(all_new_data, ignore_index=True)
         
         # 合并本地数据和新数据，去重并排序
         combined_df = pd.concat([local_df, new_df], ignore_index=True)
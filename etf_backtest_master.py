@@ -1,7 +1,6 @@
 import backtrader as bt
 import pandas as pd
 import os
-import glob
 from multiprocessing import Pool, cpu_count
 
 # --- 1. 定义数据加载格式 ---
@@ -16,6 +15,9 @@ class ETFDataFeed(bt.feeds.PandasData):
         ('openinterest', -1),
     )
 
+# 回测只用到这几列，其余列 (成交额/振幅/换手率等) 在解析阶段直接跳过
+OHLCV_COLS = {'日期', '开盘', '最高', '最低', '收盘', '成交量'}
+
 # --- 2. 策略核心逻辑 (同步 analyzer_V12) ---
 class SyncStrategy(bt.Strategy):
     params = (('atr_period', 14), ('atr_dist', 3.0))
@@ -48,11 +50,12 @@ class SyncStrategy(bt.Strategy):
 def run_backtest(file_path):
     code = os.path.basename(file_path).replace('.csv', '')
     try:
-        df = pd.read_csv(file_path)
+        df = pd.read_csv(file_path, usecols=lambda c: c.strip() in OHLCV_COLS)
         df.columns = [c.strip() for c in df.columns]
         df['日期'] = pd.to_datetime(df['日期'])
         # 【关键补丁】强制正序排列
-        df = df.sort_values('日期', ascending=True).reset_index(drop=True)
+        if not df['日期'].is_monotonic_increasing:
+            df = df.sort_values('日期', ascending=True).reset_index(drop=True)
         
         if len(df) < 50: return None
 
@@ -93,14 +96,24 @@ def run_backtest(file_path):
     except:
         return None
 
+def list_fund_files(data_dir='fund_data'):
+    """列出行情目录下的 CSV 文件，目录不存在时返回空列表"""
+    if not os.path.isdir(data_dir): return []
+    with os.scandir(data_dir) as it:
+        return [e.path for e in it if e.name.endswith('.csv') and not e.name.startswith('.') and e.is_file()]
+
 # --- 4. 主程序：多线程扫描 ---
 if __name__ == '__main__':
     data_dir = 'fund_data'
-    files = glob.glob(os.path.join(data_dir, "*.csv"))
+    files = list_fund_files(data_dir)
     print(f"🚀 开始回测，标的总数: {len(files)}")
 
+    # 按文件大小降序派发 (长历史先跑) 且逐个领取任务，避免个别进程拖尾；
+    # 结果按原文件顺序还原，保证排名并列时的先后不变
+    by_size = sorted(files, key=os.path.getsize, reverse=True)
     with Pool(cpu_count()) as pool:
-        results = pool.map(run_backtest, files)
+        done = dict(zip(by_size, pool.map(run_backtest, by_size, chunksize=1)))
+    results = [done[f] for f in files]
 
     # 过滤无效结果并排序
     valid_results = [r for r in results if r is not None and r['年化收益%'] != 0]
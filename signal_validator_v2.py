@@ -1,6 +1,7 @@
 import pandas as pd
 import numpy as np
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 
 # --- 配置文件路径 (根据你的要求已修改) ---
@@ -9,10 +10,47 @@ DATA_DIR = 'fund_data'
 REPORT_FILE = 'VALIDATION_REPORT.md'       
 BACKTEST_REPORT = 'backtest_results.csv'   # 已按要求修改
 NAME_LIST_FILE = 'ETF列表.xlsx'           # 已按要求修改为直接读取 Excel
+KLINE_COLS = {'日期', '收盘', '最低'}      # 校验只用到的行情列，其余列不解析
+# 报告明细行模板
+REPORT_ROW = "| {身份} | {信号日期} | {代码} | {名称} | {入场价} | {止损价} | {现价/结算} | {收益%}% | {状态} |\n"
 
 def get_beijing_time():
     return (datetime.utcnow() + timedelta(hours=8)).strftime('%Y-%m-%d %H:%M')
 
+# 同一次运行内的 K 线缓存：账本里同一代码会出现成百上千次，每个文件只解析一次
+KLINE_CACHE = {}
+
+def load_kline(code):
+    """
+    读取单标的 K 线并按日期排序，文件不存在返回 None。
+    缓存 (日期, 收盘, 自每日起的最低价) 三个 numpy 数组：
+    任一信号日之后的区间最低价只需一次下标访问
+    """
+    if code not in KLINE_CACHE:
+        file_path = os.path.join(DATA_DIR, f"{code}.csv")
+        kline = None
+        if os.path.exists(file_path):
+            df_d = pd.read_csv(file_path, usecols=lambda c: c.strip() in KLINE_COLS,
+                               dtype={'收盘': 'float64', '最低': 'float64'})
+            df_d.columns = [c.strip() for c in df_d.columns]
+            df_d['日期_dt'] = pd.to_datetime(df_d['日期'])
+            if not df_d['日期_dt'].is_monotonic_increasing:
+                df_d = df_d.sort_values('日期_dt').reset_index(drop=True)
+            lows_since = np.fmin.accumulate(df_d['最低'].to_numpy()[::-1])[::-1]
+            kline = (df_d['日期_dt'].to_numpy(), df_d['收盘'].to_numpy(), lows_since)
+        KLINE_CACHE[code] = kline
+    return KLINE_CACHE[code]
+
+def prefetch_klines(codes, max_workers=8):
+    """并发预读账本涉及的全部 K 线，读失败的留给主循环按原逻辑跳过"""
+    def _load(code):
+        try:
+            load_kline(code)
+        except Exception:
+            pass
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        list(executor.map(_load, codes))
+
 def validate():
     print(f"🔍 正在启动信号效能校验系统... {get_beijing_time()}")
 
@@ -59,44 +97,52 @@ def validate():
     except Exception as e:
         print(f"❌ 读取账本失败: {e}")
         return
+    missing_cols = [c for c in ('code', 'date') if c not in df_h.columns]
+    if missing_cols:
+        print(f"❌ 读取账本失败: 缺少列 {missing_cols}")
+        return
         
     results = []
     print(f"📈 正在分析 {len(df_h)} 条信号的盈亏表现...")
 
-    for _, row in df_h.iterrows():
+    # 按列取出账本字段逐条遍历
+    n = len(df_h)
+    elite_codes = frozenset(elite_pool)  # 逐行身份判断用 O(1) 集合查找
+    codes = [str(c).strip().zfill(6) for c in df_h['code']]
+    prefetch_klines(sorted(set(codes)))
+    ledger_names = df_h['name'] if 'name' in df_h.columns else [None] * n
+    entry_col = 'entry_price' if 'entry_price' in df_h.columns else 'price'
+    entries = df_h[entry_col] if entry_col in df_h.columns else [0] * n
+    stops = df_h['stop'] if 'stop' in df_h.columns else [0] * n
+
+    for code, raw_date, ledger_name, raw_entry, raw_stop in zip(codes, df_h['date'], ledger_names, entries, stops):
         try:
-            code = str(row['code']).strip().zfill(6)
-            signal_date = str(row['date']).strip()
+            signal_date = str(raw_date).strip()
             
             # 名称翻译：优先用 Excel 里的中文，没有则用账本里的
-            real_name = name_map.get(code, row.get('name', f"ETF_{code}"))
-            is_elite = code in elite_pool
+            real_name = name_map.get(code, f"ETF_{code}" if ledger_name is None else ledger_name)
+            is_elite = code in elite_codes
             identity_tag = "🏆精英" if is_elite else "⚪普通"
             display_name = f"🏆{real_name}" if is_elite else real_name
 
             # 获取 K 线数据计算
-            file_path = os.path.join(DATA_DIR, f"{code}.csv")
-            if not os.path.exists(file_path): continue
-            
-            df_d = pd.read_csv(file_path)
-            df_d.columns = [c.strip() for c in df_d.columns]
-            df_d['日期_dt'] = pd.to_datetime(df_d['日期'])
-            df_d = df_d.sort_values('日期_dt').reset_index(drop=True)
+            kline = load_kline(code)
+            if kline is None: continue
+            dates, closes, lows_since = kline
             
             # 价格提取 (适配新账本 13 列)
-            entry_p = float(row.get('entry_price', row.get('price', 0)))
-            stop_p = float(row.get('stop', 0))
+            entry_p = float(raw_entry)
+            stop_p = float(raw_stop)
             if stop_p == 0: stop_p = entry_p * 0.93 # 容错止损
 
-            # 计算信号日之后的表现
-            df_after = df_d[df_d['日期_dt'] > pd.to_datetime(signal_date)]
+            # 计算信号日之后的表现：有序日期上二分定位信号日之后的第一根 K 线
+            start = dates.searchsorted(pd.to_datetime(signal_date).to_datetime64(), side='right')
             
-            if df_after.empty:
+            if start == len(dates):
                 status, last_p, curr_ret = "⏳ 观察中", entry_p, 0.0
             else:
-                last_row = df_after.iloc[-1]
-                last_p = last_row['收盘']
-                lowest_since = df_after['最低'].min()
+                last_p = closes[-1]
+                lowest_since = lows_since[start]
                 
                 if lowest_since <= stop_p:
                     status, last_p = "❌ 已止损", stop_p
@@ -119,20 +165,22 @@ def validate():
     df_res = pd.DataFrame(results)
     df_sorted = df_res.sort_values(['身份', '信号日期'], ascending=[False, False])
 
+    # 核心数据统计
+    total = len(df_res)
+    wins = len(df_res[df_res['状态'] == '✅ 盈利中'])
+
+    lines = [
+        f"# 🔍 信号实战校验报告 (Elite-V12)\n\n",
+        f"更新时间: `{get_beijing_time()}`\n\n",
+        f"### 📊 总体战绩统计\n- 累计信号: `{total}` | 盈利中: `{wins}` | 胜率: `{(wins/total*100):.2f}%` (含观察)\n\n",
+        "### 📝 详细信号列表\n",
+        "| 身份 | 信号日期 | 代码 | 名称 | 入场价 | 止损价 | 现价/结算 | 收益% | 状态 |\n",
+        "| --- | --- | --- | --- | --- | --- | --- | --- | --- |\n",
+    ]
+    lines += [REPORT_ROW.format_map(r) for r in df_sorted.to_dict('records')]
+
     with open(REPORT_FILE, 'w', encoding='utf_8_sig') as f:
-        f.write(f"# 🔍 信号实战校验报告 (Elite-V12)\n\n")
-        f.write(f"更新时间: `{get_beijing_time()}`\n\n")
-        
-        # 核心数据统计
-        total = len(df_res)
-        wins = len(df_res[df_res['状态'] == '✅ 盈利中'])
-        f.write(f"### 📊 总体战绩统计\n- 累计信号: `{total}` | 盈利中: `{wins}` | 胜率: `{(wins/total*100):.2f}%` (含观察)\n\n")
-        
-        f.write("### 📝 详细信号列表\n")
-        f.write("| 身份 | 信号日期 | 代码 | 名称 | 入场价 | 止损价 | 现价/结算 | 收益% | 状态 |\n")
-        f.write("| --- | --- | --- | --- | --- | --- | --- | --- | --- |\n")
-        for _, r in df_sorted.iterrows():
-            f.write(f"| {r['身份']} | {r['信号日期']} | {r['代码']} | {r['名称']} | {r['入场价']} | {r['止损价']} | {r['现价/结算']} | {r['收益%']}% | {r['状态']} |\n")
+        f.write("".join(lines))
 
     print(f"✅ 报告生成成功: {REPORT_FILE}")
 
@@ -3,7 +3,10 @@ import glob
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
 from multiprocessing import Pool, cpu_count
+from numpy.lib.stride_tricks import sliding_window_view
 
 # ==========================================
 # --- 1. 核心锁死风控与策略参数 ---
@@ -15,6 +18,10 @@ RETR_WATCH = -20.0         # 回撤阈值锁定为 -20.0
 RETR_WINDOW = 250          # 250日实战周期
 RSI_LOW = 30           
 BIAS_LOW = -5.0        
+INDICATOR_TAIL = 30        # RSI/BIAS 只需末端：背离回看 20 日 + RSI 周期 6
+# 行情文件只需日期与收盘 (兼容 ETF 行情与 净值 两种格式)，其余列不解析
+PRICE_COLS = {'日期', '收盘', 'date', 'net_value'}
+PRICE_DTYPES = {'收盘': 'float64', 'net_value': 'float64'}
 
 # ==========================================
 # --- 2. 映射逻辑：加载 ETF 名称 ---
@@ -30,40 +37,73 @@ def load_name_mapping():
             except:
                 df_map = pd.read_csv('ETF列表.txt', sep='\t', dtype={'证券代码': str}, encoding='gbk')
             
-            for _, row in df_map.iterrows():
-                code = str(row['证券代码']).zfill(6)
-                mapping[code] = row['证券简称']
+            codes = [str(c).zfill(6) for c in df_map['证券代码']]
+            mapping = dict(zip(codes, df_map['证券简称']))
     except Exception as e:
         print(f"名称映射加载失败: {e}")
     return mapping
 
-# 预加载全局映射表
-NAME_MAP = load_name_mapping()
+@lru_cache(maxsize=1)
+def get_name_map():
+    """全局名称映射，进程内只加载一次"""
+    return load_name_mapping()
 
 # ==========================================
 # --- 3. 技术指标计算模块 ---
 # ==========================================
-def calculate_rsi(series, period=6):
-    delta = series.diff()
-    gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-    loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-    rs = gain / loss.replace(0, np.nan)
-    return 100 - (100 / (1 + rs.fillna(0)))
-
-def check_rsi_divergence(df, window=20):
+def rolling_window(values, window, func):
+    """基于 numpy 滑动窗口视图的滚动计算，前 window-1 位补 NaN (与 pandas.rolling 对齐)"""
+    out = np.full(len(values), np.nan)
+    if len(values) >= window:
+        out[window - 1:] = func(sliding_window_view(values, window), axis=1)
+    return out
+
+def calculate_rsi(close, period=6):
+    delta = np.diff(close, prepend=np.nan)
+    # 拆出涨/跌幅，NaN 按 0 处理
+    gain = rolling_window(np.fmax(delta, 0.0), period, np.mean)
+    loss = rolling_window(np.fmax(-delta, 0.0), period, np.mean)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rs = np.where(loss > 0, gain / loss, 0.0)
+    return 100 - (100 / (1 + rs))
+
+def calculate_indicators(close, tail=None):
+    """计算 RSI / MA6 / BIAS (指定 tail 时只算最后 tail 根，之前补 NaN) 及 250日高点与回撤"""
+    n = len(close)
+    start = 0 if tail is None else max(n - tail, 0)
+    recent = close[start:]
+    rsi, ma6, bias = np.full(n, np.nan), np.full(n, np.nan), np.full(n, np.nan)
+    rsi[start:] = calculate_rsi(recent, 6)
+    ma6[start:] = rolling_window(recent, 6, np.mean)
+    bias[start:] = (recent - ma6[start:]) / ma6[start:] * 100
+    # 250日高点用 pandas 的 O(n) 滚动最大值；滑动窗口视图在此要 O(n·250)
+    max_high = pd.Series(close).rolling(RETR_WINDOW).max().to_numpy()
+    return {
+        'rsi': rsi,
+        'ma6': ma6,
+        'bias': bias,
+        'max_high': max_high,
+        'retr': (close - max_high) / max_high * 100,
+    }
+
+def count_trailing(flags):
+    """末尾连续为 True 的天数 (即最新一日的持续天数)"""
+    breaks = ~flags[::-1]
+    return int(breaks.argmax()) if breaks.any() else len(flags)
+
+def check_rsi_divergence(close, rsi, window=20):
     """
     RSI底背离检测：价格创出window日内新低，但RSI未创新低且显著回升
     """
-    if len(df) < window + 5: return False
-    curr_price = df['收盘'].iloc[-1]
-    curr_rsi = df['rsi'].iloc[-1]
-    
-    lookback_df = df.iloc[-(window+1):-1]
-    if lookback_df.empty: return False
+    if len(close) < window + 5: return False
+    curr_price = close[-1]
+    curr_rsi = rsi[-1]
     
-    min_price_idx = lookback_df['收盘'].idxmin()
-    min_price_val = lookback_df['收盘'].min()
-    min_price_rsi = lookback_df.loc[min_price_idx, 'rsi']
+    # 回看窗口内的价格低点及当日 RSI
+    lookback_close = close[-(window+1):-1]
+    min_pos = np.nanargmin(lookback_close)
+    min_price_val = lookback_close[min_pos]
+    min_price_rsi = rsi[-(window+1):-1][min_pos]
     
     # 底背离判断条件
     if curr_price <= min_price_val and curr_rsi > min_price_rsi + 2:
@@ -75,122 +115,150 @@ def check_rsi_divergence(df, window=20):
 # ==========================================
 def process_file(file_path):
     try:
-        try: df = pd.read_csv(file_path, encoding='utf-8')
-        except: df = pd.read_csv(file_path, encoding='gbk')
+        try: df = pd.read_csv(file_path, encoding='utf-8', usecols=lambda c: c in PRICE_COLS, dtype=PRICE_DTYPES)
+        except: df = pd.read_csv(file_path, encoding='gbk', usecols=lambda c: c in PRICE_COLS, dtype=PRICE_DTYPES)
         
+        if len(df) < 30: return None
         if 'net_value' in df.columns:
             df = df.rename(columns={'date': '日期', 'net_value': '收盘'})
         df['日期'] = pd.to_datetime(df['日期'])
-        df = df.sort_values(by='日期').reset_index(drop=True)
+        if not df['日期'].is_monotonic_increasing:
+            df = df.sort_values(by='日期').reset_index(drop=True)
         
         # --- 数据清洗：拦截净值异常跳变为1.0（数据源缺失）的情况 ---
-        if len(df) < 30: return None
-        curr_p = df['收盘'].iloc[-1]
-        prev_p = df['收盘'].iloc[-2]
+        close = df['收盘'].to_numpy(dtype=float)
+        curr_p, prev_p = close[-1], close[-2]
         if curr_p == 1.0 and prev_p > 1.1: return None
         
-        # 计算基础指标
-        df['rsi'] = calculate_rsi(df['收盘'], 6)
-        df['ma6'] = df['收盘'].rolling(window=6).mean()
-        df['bias'] = ((df['收盘'] - df['ma6']) / df['ma6']) * 100
-        df['max_high'] = df['收盘'].rolling(window=RETR_WINDOW).max()
-        df['retr'] = ((df['收盘'] - df['max_high']) / df['max_high']) * 100
+        # 最新一日未进入 -20% 观察区则无需计算全量指标
+        if len(close) < RETR_WINDOW: return None
+        peak = np.nanmax(close[-RETR_WINDOW:])
+        if not (curr_p - peak) / peak * 100 <= RETR_WATCH: return None
         
-        # 信号判定逻辑
-        df['in_watch'] = df['retr'] <= RETR_WATCH
-        df['persist_days'] = df['in_watch'].groupby((df['in_watch'] != df['in_watch'].shift()).cumsum()).cumcount() + 1
-        df.loc[~df['in_watch'], 'persist_days'] = 0
-
-        curr = df.iloc[-1]
-        code = os.path.splitext(os.path.basename(file_path))[0].zfill(6)
-        name = NAME_MAP.get(code, "未知品种")
+        # 计算基础指标
+        ind = calculate_indicators(close, tail=INDICATOR_TAIL)
         
-        if curr['in_watch']:
+        # 信号判定逻辑：持续天数、代码与末值只在最新一日处于观察区时才需要
+        in_watch = ind['retr'] <= RETR_WATCH
+        if in_watch[-1]:
+            curr_rsi, curr_bias, curr_retr = ind['rsi'][-1], ind['bias'][-1], ind['retr'][-1]
+            persist_days = count_trailing(in_watch)
+            code = os.path.splitext(os.path.basename(file_path))[0].zfill(6)
             score = 1
-            divergence = check_rsi_divergence(df)
-            if curr['rsi'] < RSI_LOW: score += 2
-            if curr['bias'] < BIAS_LOW: score += 2
+            divergence = check_rsi_divergence(close, ind['rsi'])
+            if curr_rsi < RSI_LOW: score += 2
+            if curr_bias < BIAS_LOW: score += 2
             if divergence: score += 2  # 背离额外加分
             
             risk_level = "正常"
             if divergence: risk_level = "📈底背离形成"
-            if curr['rsi'] > 55 and score == 1: risk_level = "🚩高风险(陷阱)"
+            if curr_rsi > 55 and score == 1: risk_level = "🚩高风险(陷阱)"
             elif score >= 5: risk_level = "🔥极高胜率(背离)"
             elif score >= 3: risk_level = "✅高胜率区"
                 
             return {
-                'date': str(curr['日期']).split(' ')[0],
+                'date': str(df['日期'].iloc[-1]).split(' ')[0],
                 'fund_code': code,
-                '名称': name,
+                '名称': None,  # 由主进程统一填充
                 '评分': score,
-                '持续天数': int(curr['persist_days']),
+                '持续天数': persist_days,
                 '风险预警': risk_level,
-                '回撤%': round(curr['retr'], 2),
-                'RSI': round(curr['rsi'], 2),
-                'BIAS': round(curr['bias'], 2),
-                'price': round(curr['收盘'], 4)
+                '回撤%': round(curr_retr, 2),
+                'RSI': round(curr_rsi, 2),
+                'BIAS': round(curr_bias, 2),
+                'price': round(close[-1], 4)
             }
     except: return None
 
 # ==========================================
 # --- 5. 盈亏统计模块 (加入最高浮盈计算) ---
 # ==========================================
+SIGNAL_COLS = ('fund_code', 'date', 'price')
+
+def read_signal_file(h_file):
+    """
+    读取单个历史信号文件并逐文件规整，失败或缺少必要列返回 None。
+    代码补零与缺省评分在合并前完成，单个异常文件不会改变其他文件的列类型
+    """
+    try: sig = pd.read_csv(h_file)
+    except: return None
+    if any(c not in sig.columns for c in SIGNAL_COLS): return None
+    sig['fund_code'] = sig['fund_code'].astype(str).str.zfill(6)
+    if '评分' not in sig.columns: sig['评分'] = 1  # 旧版信号文件无评分列，按 1 分计
+    return sig
+
+def load_price_history(code):
+    """读取单标的收盘序列 (日期统一为 YYYY-MM-DD 字符串)，文件缺失或损坏返回 None"""
+    raw_path = f'fund_data/{code}.csv'
+    if not os.path.exists(raw_path): return None
+    try:
+        raw_df = pd.read_csv(raw_path, usecols=lambda c: c in PRICE_COLS, dtype=PRICE_DTYPES)
+        if 'net_value' in raw_df.columns: raw_df = raw_df.rename(columns={'date': '日期', 'net_value': '收盘'})
+        raw_df['日期'] = pd.to_datetime(raw_df['日期']).dt.strftime('%Y-%m-%d')
+        return raw_df
+    except: return None
+
 def get_performance_stats():
-    history_files = glob.glob('202*/**/*.csv', recursive=True)
-    perf_list = []
-    for h_file in history_files:
-        if 'perf' in h_file: continue
-        try:
-            h_df = pd.read_csv(h_file)
-            for _, sig in h_df.iterrows():
-                code = str(sig['fund_code']).zfill(6)
-                raw_path = f'fund_data/{code}.csv'
-                if not os.path.exists(raw_path): continue
-                raw_df = pd.read_csv(raw_path)
-                if 'net_value' in raw_df.columns: raw_df = raw_df.rename(columns={'date': '日期', 'net_value': '收盘'})
-                raw_df['日期'] = pd.to_datetime(raw_df['日期']).dt.strftime('%Y-%m-%d')
-                
-                idx_list = raw_df[raw_df['日期'] == str(sig['date'])].index
-                if not idx_list.empty:
-                    curr_idx = idx_list[0]
-                    signal_price = sig['price']
-                    
-                    # 获取信号发出后的轨迹
-                    after_signal_df = raw_df.iloc[curr_idx:]
-                    latest_price = after_signal_df['收盘'].iloc[-1]
-                    
-                    # 统计端清洗
-                    if latest_price == 1.0 and signal_price > 1.1: continue
-                    
-                    # 【核心新增】计算最高浮盈
-                    max_price_after = after_signal_df['收盘'].max()
-                    max_profit = (max_price_after - signal_price) / signal_price * 100
-                    
-                    # 计算今日涨跌
-                    prev_price = raw_df.iloc[-2]['收盘'] if len(raw_df) > 1 else latest_price
-                    daily_raw = (latest_price - prev_price) / prev_price * 100
-                    color_tag = "🔴 " if daily_raw > 0 else "🟢 " if daily_raw < 0 else ""
-                    daily_display = f"{color_tag}{daily_raw:+.2f}%"
-                    
-                    # 计算当前总盈亏
-                    total_hold_change = (latest_price - signal_price) / signal_price * 100
-                    
-                    # 计算回本天数
-                    recovery_df = raw_df.iloc[curr_idx+1:]
-                    back_days = "未回本"
-                    back_idx = recovery_df[recovery_df['收盘'] >= signal_price].index
-                    if not back_idx.empty: back_days = int(back_idx[0] - curr_idx)
-                    
-                    perf_list.append({
-                        '日期': sig['date'], '代码': code, '名称': NAME_MAP.get(code, "未知"),
-                        '评分': sig.get('评分', 1), '信号价': round(signal_price, 4), 
-                        '最新价': round(latest_price, 4), '今日涨跌': daily_display, 
-                        '最高浮盈%': round(max_profit, 2), # 新增展示
-                        '总盈亏%': round(total_hold_change, 2), '回本天数': back_days,
-                        '状态': "✅反弹中" if total_hold_change > 1 else "❌走弱" if total_hold_change < -3 else "⏳磨底中"
-                    })
-        except: continue
-    return pd.DataFrame(perf_list)
+    # 所有历史信号合并成一张长表，按代码分组：每个标的的行情文件只读一次
+    # 信号文件与行情文件都用线程池并发读取，结果按提交顺序返回
+    history_files = [f for f in glob.glob('202*/**/*.csv', recursive=True) if 'perf' not in f]
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        frames = [f for f in executor.map(read_signal_file, history_files) if f is not None]
+    if not frames: return pd.DataFrame()
+    signals = pd.concat(frames, ignore_index=True)
+
+    groups = list(signals.groupby('fund_code', sort=False))
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        price_frames = list(executor.map(load_price_history, [code for code, _ in groups]))
+
+    perf_rows = {}
+    for (code, group), raw_df in zip(groups, price_frames):
+        if raw_df is None: continue
+
+        # 整段轨迹统计一次算好：日期 -> 首次出现的位置，及自每个位置起的最高收盘价
+        close = raw_df['收盘'].to_numpy()
+        first_pos = pd.Series(np.arange(len(raw_df)), index=raw_df['日期'])
+        first_pos = first_pos[~first_pos.index.duplicated()]
+        sig_pos = first_pos.reindex(group['date'].astype(str)).to_numpy()
+        suffix_max = np.fmax.accumulate(close[::-1])[::-1]
+        latest_price = close[-1]
+        # 计算今日涨跌
+        prev_price = close[-2] if len(close) > 1 else latest_price
+        daily_raw = (latest_price - prev_price) / prev_price * 100
+        color_tag = "🔴 " if daily_raw > 0 else "🟢 " if daily_raw < 0 else ""
+        daily_display = f"{color_tag}{daily_raw:+.2f}%"
+        name = get_name_map().get(code, "未知")  # 同一代码的名称只查一次
+
+        for row_id, sig_date, signal_price, score, pos in zip(group.index, group['date'], group['price'], group['评分'], sig_pos):
+            try:
+                if np.isnan(pos): continue
+                curr_idx = int(pos)
+
+                # 统计端清洗
+                if latest_price == 1.0 and signal_price > 1.1: continue
+
+                # 【核心新增】计算最高浮盈
+                max_profit = (suffix_max[curr_idx] - signal_price) / signal_price * 100
+
+                # 计算当前总盈亏
+                total_hold_change = (latest_price - signal_price) / signal_price * 100
+
+                # 计算回本天数
+                back_days = "未回本"
+                back_idx = np.flatnonzero(close[curr_idx+1:] >= signal_price)
+                if back_idx.size: back_days = int(back_idx[0] + 1)
+
+                perf_rows[row_id] = {
+                    '日期': sig_date, '代码': code, '名称': name,
+                    '评分': score, '信号价': round(signal_price, 4), 
+                    '最新价': round(latest_price, 4), '今日涨跌': daily_display, 
+                    '最高浮盈%': round(max_profit, 2), # 新增展示
+                    '总盈亏%': round(total_hold_change, 2), '回本天数': back_days,
+                    '状态': "✅反弹中" if total_hold_change > 1 else "❌走弱" if total_hold_change < -3 else "⏳磨底中"
+                }
+            except: continue
+    # 按信号原始顺序输出
+    return pd.DataFrame([perf_rows[k] for k in sorted(perf_rows)])
 
 # ==========================================
 # --- 6. 报告生成 (北京时间版) ---
@@ -199,7 +267,7 @@ def update_readme(current_res, perf_df):
     now_utc = datetime.now(timezone.utc)
     now_bj = (now_utc + timedelta(hours=8)).strftime('%Y-%m-%d %H:%M:%S')
     
-    content = f"# 🤖 ETF/基金 策略雷达 (250日实战锁死版)\n\n> 最后更新: `{now_bj}` (北京时间)\n\n"
+    parts = [f"# 🤖 ETF/基金 策略雷达 (250日实战锁死版)\n\n> 最后更新: `{now_bj}` (北京时间)\n\n"]
     
     total_invested = 0
     total_profit_loss_val = 0
@@ -207,55 +275,66 @@ def update_readme(current_res, perf_df):
     is_budget_full = False
     is_panic_mode = False
 
-    # 预先计算风控状态
+    # 近14日的3分以上信号只筛一次，风控盘口与活跃追踪共用
+    recent_focus = pd.DataFrame()
     if not perf_df.empty:
         recent_limit = (datetime.now() - timedelta(days=14)).strftime('%Y-%m-%d')
-        active_focus = perf_df[(perf_df['评分'] >= 3) & (perf_df['日期'] >= recent_limit)].drop_duplicates(subset=['代码'])
-        
-        if not active_focus.empty:
-            total_invested = len(active_focus) * PORTFOLIO_UNIT
-            total_profit_loss_val = (active_focus['总盈亏%'] / 100 * PORTFOLIO_UNIT).sum()
-            avg_return_rate = (total_profit_loss_val / total_invested) * 100 if total_invested > 0 else 0
-            is_budget_full = total_invested >= TOTAL_BUDGET_CAP
-            is_panic_mode = avg_return_rate <= STOP_BUY_LOSS_RATIO
-
-            content += "## 💰 实战风控盘口 (1万资金上限)\n"
-            content += f"> **模拟投入**: `¥{total_invested} / ¥{TOTAL_BUDGET_CAP}` | **总盈亏**: `{'🔴' if total_profit_loss_val > 0 else '🟢'} ¥{total_profit_loss_val:.2f} ({avg_return_rate:+.2f}%)` \n"
-            status_desc = "🛡️ 预算内" if not is_budget_full else "⛔ 预算满员"
-            if is_panic_mode: status_desc += " | ❌ 禁买令 (总亏损过大)"
-            content += f"> **风控状态**: `{status_desc}`\n\n"
-
-    content += "## 🎯 实时信号监控 (-20%阈值 + 底背离检测)\n"
+        recent_focus = perf_df[(perf_df['评分'] >= 3) & (perf_df['日期'] >= recent_limit)]
+
+    # 预先计算风控状态
+    if not recent_focus.empty:
+        active_focus = recent_focus.drop_duplicates(subset=['代码'])
+        total_invested = len(active_focus) * PORTFOLIO_UNIT
+        total_profit_loss_val = (active_focus['总盈亏%'] / 100 * PORTFOLIO_UNIT).sum()
+        avg_return_rate = (total_profit_loss_val / total_invested) * 100 if total_invested > 0 else 0
+        is_budget_full = total_invested >= TOTAL_BUDGET_CAP
+        is_panic_mode = avg_return_rate <= STOP_BUY_LOSS_RATIO
+
+        status_desc = "🛡️ 预算内" if not is_budget_full else "⛔ 预算满员"
+        if is_panic_mode: status_desc += " | ❌ 禁买令 (总亏损过大)"
+        parts += [
+            "## 💰 实战风控盘口 (1万资金上限)\n",
+            f"> **模拟投入**: `¥{total_invested} / ¥{TOTAL_BUDGET_CAP}` | **总盈亏**: `{'🔴' if total_profit_loss_val > 0 else '🟢'} ¥{total_profit_loss_val:.2f} ({avg_return_rate:+.2f}%)` \n",
+            f"> **风控状态**: `{status_desc}`\n\n",
+        ]
+
+    parts.append("## 🎯 实时信号监控 (-20%阈值 + 底背离检测)\n")
     if current_res:
         df = pd.DataFrame(current_res).sort_values(['评分', '回撤%'], ascending=[False, True])
-        def decide(row):
-            if row['评分'] < 3: return "等待3分"
-            if is_budget_full: return "⛔ 预算上限"
-            if is_panic_mode: return "❌ 组合亏损(停买)"
-            return "✅ 可分批建仓"
-        df['建议'] = df.apply(decide, axis=1)
+        # 建仓建议：不足3分等待，其余按组合风控状态统一给出
+        if is_budget_full: ready = "⛔ 预算上限"
+        elif is_panic_mode: ready = "❌ 组合亏损(停买)"
+        else: ready = "✅ 可分批建仓"
+        df['建议'] = np.where(df['评分'] < 3, "等待3分", ready)
         cols = ['date', 'fund_code', '名称', '评分', '持续天数', '风险预警', '回撤%', 'RSI', 'BIAS', 'price', '建议']
-        content += df[cols].to_markdown(index=False) + "\n\n"
+        parts.append(df[cols].to_markdown(index=False) + "\n\n")
     else:
-        content += "> 💤 当前无触发 -20% 回撤阈值的品种。\n\n"
+        parts.append("> 💤 当前无触发 -20% 回撤阈值的品种。\n\n")
 
-    content += "## 🔥 活跃买点追踪 (含最高浮盈记录)\n"
-    if not perf_df.empty:
-        recent_limit = (datetime.now() - timedelta(days=14)).strftime('%Y-%m-%d')
-        active_focus = perf_df[(perf_df['评分'] >= 3) & (perf_df['日期'] >= recent_limit)].sort_values('日期', ascending=False).drop_duplicates(subset=['代码'])
-        if not active_focus.empty:
-            cols = ['日期', '代码', '名称', '评分', '信号价', '最新价', '今日涨跌', '最高浮盈%', '总盈亏%', '状态', '回本天数']
-            content += active_focus[cols].to_markdown(index=False) + "\n\n"
+    parts.append("## 🔥 活跃买点追踪 (含最高浮盈记录)\n")
+    if not recent_focus.empty:
+        active_focus = recent_focus.sort_values('日期', ascending=False).drop_duplicates(subset=['代码'])
+        cols = ['日期', '代码', '名称', '评分', '信号价', '最新价', '今日涨跌', '最高浮盈%', '总盈亏%', '状态', '回本天数']
+        parts.append(active_focus[cols].to_markdown(index=False) + "\n\n")
 
-    with open('README.md', 'w', encoding='utf-8') as f: f.write(content)
+    with open('README.md', 'w', encoding='utf-8') as f: f.write("".join(parts))
 
 # ==========================================
 # --- 7. 主程序入口 ---
 # ==========================================
+def list_fund_files(data_dir='fund_data'):
+    """列出行情目录下的 CSV 文件，目录不存在时返回空列表"""
+    if not os.path.isdir(data_dir): return []
+    with os.scandir(data_dir) as it:
+        return [e.path for e in it if e.name.endswith('.csv') and not e.name.startswith('.') and e.is_file()]
+
 def main():
-    files = glob.glob('fund_data/*.csv')
+    files = list_fund_files()
     with Pool(cpu_count()) as p:
         results = [r for r in p.map(process_file, files) if r is not None]
+    name_map = get_name_map()
+    for r in results:
+        r['名称'] = name_map.get(r['fund_code'], "未知品种")
     
     if results:
         now = datetime.now()
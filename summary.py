@@ -1,55 +1,67 @@
 import pandas as pd
 import os
+from functools import lru_cache
 from datetime import datetime, timedelta
 
 # --- 配置 ---
 VALIDATION_FILE = 'VALIDATION_REPORT.md'
 SUMMARY_FILE = 'DAILY_ACTION_PLAN.md'
 
+# 各清单的表格行模板
+BUY_ROW = "| {代码} | **{指纹}** | {名称} | {入场价} | {止损价} |\n"
+STOP_ROW = "| {代码} | {名称} | {信号日期} | {收益%} | **坚决卖出** |\n"
+PROFIT_ROW = "| {代码} | {名称} | **{收益%}** | 分批获利了结 |\n"
+
+# 指纹识别用的黑名单与语义映射
+# 核心黑名单：剔除干扰词 (按顺序逐个替换，顺序影响结果，勿改为单次正则)
+FINGERPRINT_BLACKLIST = (
+    # 基金公司
+    '华夏', '嘉实', '工银', '华泰柏瑞', '国泰', '易方达', '广发', '富国', '南方', 
+    '招商', '汇添富', '天弘', '鹏华', '华安', '大成', '万家', '博时', '银华', 
+    '中欧', '兴业', '泰康', '建信', '摩根', '景顺', '永赢', '交银',
+    # 产品后缀
+    'ETF', '联接', 'A', 'C', '基金', '指数', '增强', 'LOF', '发起式', '权重', '100', '50'
+)
+
+# 语义映射：将“长得不同但本质一样”的板块合并
+# 如果名字里包含 Key，则统一返回 Value (按插入顺序取第一个命中的 Key)
+SEMANTIC_MAP = {
+    '创业板': '创业板系列',
+    '科创': '科创板系列',
+    '芯片': '半导体芯片',
+    '半导体': '半导体芯片',
+    '人工智能': 'AI人工智通',
+    'AI': 'AI人工智通',
+    '软件': '计算机软件',
+    '互联网': '港股互联网',
+    '恒生科技': '港股互联网',
+    '纳斯达克': '纳指',
+    '纳指': '纳指',
+    '沪深300': '沪深300',
+    '中证500': '中证500',
+    '红利': '红利低波',
+    '光伏': '新能源光伏',
+    '新能源': '新能源光伏',
+    '证券': '大金融券商',
+    '券商': '大金融券商',
+    '银行': '大金融银行'
+}
+
+@lru_cache(maxsize=4096)
 def get_smart_fingerprint(full_name):
     """
     指纹识别算法：提取基金的核心灵魂，过滤公司名和语义重叠。
+    纯函数：同名基金只清洗一次，重复名称直接命中缓存。
     """
     # 1. 基础清洗
     name = str(full_name).replace('🏆', '').replace('⚪', '').strip()
     
-    # 2. 核心黑名单：剔除干扰词
-    blacklist = [
-        # 基金公司
-        '华夏', '嘉实', '工银', '华泰柏瑞', '国泰', '易方达', '广发', '富国', '南方', 
-        '招商', '汇添富', '天弘', '鹏华', '华安', '大成', '万家', '博时', '银华', 
-        '中欧', '兴业', '泰康', '建信', '摩根', '景顺', '永赢', '交银',
-        # 产品后缀
-        'ETF', '联接', 'A', 'C', '基金', '指数', '增强', 'LOF', '发起式', '权重', '100', '50'
-    ]
-    for word in blacklist:
+    # 2. 剔除黑名单干扰词
+    for word in FINGERPRINT_BLACKLIST:
         name = name.replace(word, '')
 
-    # 3. 语义映射：将“长得不同但本质一样”的板块合并
-    # 如果名字里包含 Key，则统一返回 Value
-    semantic_map = {
-        '创业板': '创业板系列',
-        '科创': '科创板系列',
-        '芯片': '半导体芯片',
-        '半导体': '半导体芯片',
-        '人工智能': 'AI人工智通',
-        'AI': 'AI人工智通',
-        '软件': '计算机软件',
-        '互联网': '港股互联网',
-        '恒生科技': '港股互联网',
-        '纳斯达克': '纳指',
-        '纳指': '纳指',
-        '沪深300': '沪深300',
-        '中证500': '中证500',
-        '红利': '红利低波',
-        '光伏': '新能源光伏',
-        '新能源': '新能源光伏',
-        '证券': '大金融券商',
-        '券商': '大金融券商',
-        '银行': '大金融银行'
-    }
-    
-    for key, val in semantic_map.items():
+    # 3. 语义映射
+    for key, val in SEMANTIC_MAP.items():
         if key in name:
             return val
             
@@ -106,33 +118,33 @@ def generate_summary():
     profit_list = df[df['profit_val'] >= 10.0]
 
     # 4. 输出最终行动指南
+    lines = [
+        f"# 🏹 每日实战指挥手册 ({bj_today})\n\n",
+        f"> **防重策略**：系统已从 1000+ 标的中自动识别语义重叠，合并了同类板块，确保持仓分散。\n\n",
+        "## 🟢 今日买入指令 (精选唯一标的)\n",
+    ]
+    if not buy_list.empty:
+        lines.append("| 代码 | 指纹分类 | 推荐标的 | 入场参考 | 止损位 |\n| --- | --- | --- | --- | --- |\n")
+        lines += [BUY_ROW.format_map(r) for r in buy_list.to_dict('records')]
+    else:
+        lines.append("*今日暂无新信号，或信号已被语义合并。*\n")
+
+    lines.append("\n## 🔴 强制平仓清单 (止损避险)\n")
+    if not stop_list.empty:
+        lines.append("| 代码 | 名称 | 信号日期 | 盈亏 | 动作 |\n| --- | --- | --- | --- | --- |\n")
+        lines += [STOP_ROW.format_map(r) for r in stop_list.to_dict('records')]
+    else:
+        lines.append("*持仓安全，无触发止损标的。*\n")
+
+    lines.append("\n## 🟡 减仓获利建议 (收益 > 10%)\n")
+    if not profit_list.empty:
+        lines.append("| 代码 | 名称 | 累计收益 | 操作建议 |\n| --- | --- | --- | --- |\n")
+        lines += [PROFIT_ROW.format_map(r) for r in profit_list.to_dict('records')]
+    else:
+        lines.append("*暂无收益达标标的，让利润再飞一会儿。*\n")
+
     with open(SUMMARY_FILE, 'w', encoding='utf_8_sig') as f:
-        f.write(f"# 🏹 每日实战指挥手册 ({bj_today})\n\n")
-        f.write(f"> **防重策略**：系统已从 1000+ 标的中自动识别语义重叠，合并了同类板块，确保持仓分散。\n\n")
-        
-        f.write("## 🟢 今日买入指令 (精选唯一标的)\n")
-        if not buy_list.empty:
-            f.write("| 代码 | 指纹分类 | 推荐标的 | 入场参考 | 止损位 |\n| --- | --- | --- | --- | --- |\n")
-            for _, r in buy_list.iterrows():
-                f.write(f"| {r['代码']} | **{r['指纹']}** | {r['名称']} | {r['入场价']} | {r['止损价']} |\n")
-        else:
-            f.write("*今日暂无新信号，或信号已被语义合并。*\n")
-
-        f.write("\n## 🔴 强制平仓清单 (止损避险)\n")
-        if not stop_list.empty:
-            f.write("| 代码 | 名称 | 信号日期 | 盈亏 | 动作 |\n| --- | --- | --- | --- | --- |\n")
-            for _, r in stop_list.iterrows():
-                f.write(f"| {r['代码']} | {r['名称']} | {r['信号日期']} | {r['收益%']} | **坚决卖出** |\n")
-        else:
-            f.write("*持仓安全，无触发止损标的。*\n")
-
-        f.write("\n## 🟡 减仓获利建议 (收益 > 10%)\n")
-        if not profit_list.empty:
-            f.write("| 代码 | 名称 | 累计收益 | 操作建议 |\n| --- | --- | --- | --- |\n")
-            for _, r in profit_list.iterrows():
-                f.write(f"| {r['代码']} | {r['名称']} | **{r['收益%']}** | 分批获利了结 |\n")
-        else:
-            f.write("*暂无收益达标标的，让利润再飞一会儿。*\n")
+        f.write("".join(lines))
 
     print(f"✅ 终极行动清单已生成: {SUMMARY_FILE}")
 